@@ -0,0 +1,85 @@
+"""Measure cold start to first dispatch.
+
+    python3 -m app.bench_startup --runs 5
+
+Each run seeds a fresh database with one queued job, spawns a new Python
+process and polls the database until the job turns ``running``. The
+standalone worker (``python3 -m app.worker``) is compared with the web app
+running its worker in-process.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+from . import db
+
+CNC_MANAGER_DIR = Path(__file__).resolve().parents[1]
+
+VARIANTS = {
+    "worker process": [sys.executable, "-m", "app.worker", "--poll-interval", "0.05"],
+    "web app + in-process worker": [
+        sys.executable,
+        "-c",
+        "import time; from app.main import create_app; create_app(); time.sleep(60)",
+    ],
+}
+
+
+def seed(db_path: Path) -> int:
+    db.DB_PATH = db_path
+    db._schema_ready = False
+    db.init_db()
+    program_id = db.create_program(name="bench", code_text="G0 X0 Y0", estimated_duration_seconds=30)
+    return db.enqueue_job(program_id)
+
+
+def time_to_first_dispatch(cmd: List[str], timeout: float = 30.0) -> float:
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.db"
+        job_id = seed(db_path)
+        env = dict(os.environ, CNC_DB_PATH=str(db_path))
+        started = time.monotonic()
+        proc = subprocess.Popen(cmd, cwd=CNC_MANAGER_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            while db.get_job_status(job_id) != "running":
+                if proc.poll() is not None:
+                    raise RuntimeError(f"{cmd} exited with {proc.returncode} before dispatching")
+                if time.monotonic() - started > timeout:
+                    raise TimeoutError(f"{cmd} did not dispatch within {timeout} s")
+                time.sleep(0.002)
+            return time.monotonic() - started
+        finally:
+            # The job is mid-execution, which a graceful SIGTERM would wait out
+            proc.kill()
+            proc.wait()
+
+
+def heavy_modules_in_worker() -> List[str]:
+    probe = "import sys, app.worker; print(' '.join(m for m in ('flask', 'jinja2', 'sqlalchemy') if m in sys.modules))"
+    out = subprocess.run([sys.executable, "-c", probe], cwd=CNC_MANAGER_DIR, capture_output=True, text=True, check=True)
+    return out.stdout.split()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python3 -m app.bench_startup")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    heavy = heavy_modules_in_worker()
+    print(f"Heavy modules imported by app.worker: {', '.join(heavy) if heavy else 'none'}\n")
+    print(f"{'variant':<30}{'median, s':>11}{'min, s':>9}{'max, s':>9}")
+    for label, cmd in VARIANTS.items():
+        samples = [time_to_first_dispatch(cmd) for _ in range(args.runs)]
+        print(f"{label:<30}{statistics.median(samples):>11.3f}{min(samples):>9.3f}{max(samples):>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
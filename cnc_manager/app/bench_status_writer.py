@@ -0,0 +1,76 @@
+"""Job status transitions per second, per-call commits vs group commit.
+
+    python3 -m app.bench_status_writer --seconds 3 --threads 1 16
+
+Every thread owns one job and cycles it through
+running -> paused -> queued -> running -> completed -> queued, waiting for
+each transition to be durable before issuing the next one, like the worker
+and the web handlers do.
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, List
+
+from . import db
+
+CYCLE = ("running", "paused", "queued", "running", "completed", "queued")
+
+
+def run(update: Callable[..., None], n_threads: int, seconds: float) -> int:
+    program_id = db.create_program(name=f"bench-{time.monotonic_ns()}", code_text="G0", estimated_duration_seconds=10)
+    job_ids = [db.enqueue_job(program_id) for _ in range(n_threads)]
+    counts = [0] * n_threads
+    deadline = time.monotonic() + seconds
+
+    def client(i: int) -> None:
+        while time.monotonic() < deadline:
+            update(job_ids[i], CYCLE[counts[i] % len(CYCLE)], machine_name="bench")
+            counts[i] += 1
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(n_threads)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # Every job must end on the state of its last submitted transition
+    for job_id, count in zip(job_ids, counts):
+        expected = CYCLE[(count - 1) % len(CYCLE)]
+        actual = db.get_job_status(job_id)
+        if actual != expected:
+            raise AssertionError(f"job {job_id}: expected {expected}, got {actual}")
+    return sum(counts)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python3 -m app.bench_status_writer")
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 16])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = Path(tmp) / "bench.db"
+        db._schema_ready = False
+        db.init_db()
+        writer = db.get_status_writer()
+
+        print(f"{'mode':<14}{'threads':>8}{'transitions/s':>15}{'per commit':>12}")
+        for n_threads in args.threads:
+            results: List[str] = []
+            total = run(db.update_job_status_direct, n_threads, args.seconds)
+            results.append(f"{'per-call':<14}{n_threads:>8}{total / args.seconds:>15.0f}{1:>12.1f}")
+
+            batches, updates = writer.batches_committed, writer.updates_committed
+            total = run(db.update_job_status, n_threads, args.seconds)
+            per_commit = (writer.updates_committed - updates) / max(writer.batches_committed - batches, 1)
+            results.append(f"{'group commit':<14}{n_threads:>8}{total / args.seconds:>15.0f}{per_commit:>12.1f}")
+            print("\n".join(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,49 @@
 from __future__ import annotations
 
+import atexit
+import math
+import os
+import queue
 import sqlite3
+import threading
+import time
+from concurrent.futures import Future
 from pathlib import Path
-from contextlib import contextmanager
-from datetime import datetime
+from contextlib import closing, contextmanager
+from datetime import datetime, timedelta
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
-DB_PATH = PROJECT_ROOT / "cnc_manager.db"
+DB_PATH = Path(os.environ.get("CNC_DB_PATH", PROJECT_ROOT / "cnc_manager.db"))
+
+# Bump together with a new block in ``_MIGRATIONS`` whenever the schema changes.
+# Migrations must stay idempotent (IF NOT EXISTS), as two processes may race on a fresh file.
+SCHEMA_VERSION = 4
+
+TERMINAL_STATUSES = ("completed", "failed", "canceled")
+
+# Terminal jobs older than this move to ``jobs_archive``; the hot table is also
+# capped at ARCHIVE_MAX_HOT_TERMINAL finished rows regardless of age.
+ARCHIVE_RETENTION_DAYS = float(os.environ.get("CNC_ARCHIVE_RETENTION_DAYS", 30))
+ARCHIVE_MAX_HOT_TERMINAL = int(os.environ.get("CNC_ARCHIVE_MAX_HOT_TERMINAL", 10000))
+ARCHIVE_BATCH_SIZE = 200
+
+# How long the status writer lingers for more transitions before committing. 0 means
+# commit as soon as the writer is free: transitions arriving during one commit form the
+# next batch, which batches under load without delaying a lone caller.
+GROUP_COMMIT_WINDOW_SECONDS = 0.0
+GROUP_COMMIT_MAX_BATCH = 256
+
+# Learned cycle times replace the typed-in estimate once this many runs were seen
+DURATION_MIN_SAMPLES = 3
+# Ordering weight for jobs nothing is known about yet (same cap as the mock adapter's guess)
+DURATION_FALLBACK_SECONDS = 60.0
+DURATION_QUANTILES = {"p50_seconds": 0.5, "p90_seconds": 0.9}
+
+_JOB_COLUMNS = "id, program_id, status, priority, queued_at, started_at, finished_at, machine_name, error_message"
+
+_schema_lock = threading.Lock()
+_schema_ready = False
 
 
 def _connect() -> sqlite3.Connection:
@@ -16,36 +52,176 @@ def _connect() -> sqlite3.Connection:
     return conn
 
 
+_MIGRATIONS = {
+    1: """
+    CREATE TABLE IF NOT EXISTS programs (
+      id INTEGER PRIMARY KEY AUTOINCREMENT,
+      name TEXT UNIQUE NOT NULL,
+      code_text TEXT NOT NULL,
+      estimated_duration_seconds INTEGER,
+      created_at TEXT NOT NULL,
+      updated_at TEXT NOT NULL
+    );
+
+    CREATE TABLE IF NOT EXISTS jobs (
+      id INTEGER PRIMARY KEY AUTOINCREMENT,
+      program_id INTEGER NOT NULL,
+      status TEXT NOT NULL,
+      priority INTEGER NOT NULL,
+      queued_at TEXT NOT NULL,
+      started_at TEXT,
+      finished_at TEXT,
+      machine_name TEXT,
+      error_message TEXT,
+      FOREIGN KEY(program_id) REFERENCES programs(id)
+    );
+    """,
+    # Job history archive. ``jobs`` keeps active work plus recent history; older
+    # terminal rows move here and are folded into ``job_rollups`` for reports.
+    # ids stay unique across both tables because ``jobs`` uses AUTOINCREMENT.
+    2: """
+    CREATE TABLE IF NOT EXISTS jobs_archive (
+      id INTEGER PRIMARY KEY,
+      program_id INTEGER NOT NULL,
+      status TEXT NOT NULL,
+      priority INTEGER NOT NULL,
+      queued_at TEXT NOT NULL,
+      started_at TEXT,
+      finished_at TEXT,
+      machine_name TEXT,
+      error_message TEXT,
+      archived_at TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS ix_jobs_archive_queued_at ON jobs_archive(queued_at);
+
+    CREATE TABLE IF NOT EXISTS job_rollups (
+      day TEXT NOT NULL,
+      status TEXT NOT NULL,
+      job_count INTEGER NOT NULL,
+      duration_total_seconds INTEGER NOT NULL,
+      duration_count INTEGER NOT NULL,
+      PRIMARY KEY (day, status)
+    );
+
+    CREATE INDEX IF NOT EXISTS ix_jobs_dispatch ON jobs(status, priority, queued_at, id);
+    CREATE INDEX IF NOT EXISTS ix_jobs_status_finished ON jobs(status, finished_at);
+    CREATE INDEX IF NOT EXISTS ix_jobs_queued_at ON jobs(queued_at);
+    """,
+    # Online cycle time statistics per (program, machine); machine_name '' holds
+    # the program-wide row. Seeded once from history, then updated on completion.
+    3: """
+    CREATE TABLE IF NOT EXISTS duration_stats (
+      program_id INTEGER NOT NULL,
+      machine_name TEXT NOT NULL,
+      sample_count INTEGER NOT NULL,
+      mean_seconds REAL NOT NULL,
+      m2 REAL NOT NULL,
+      p50_seconds REAL NOT NULL,
+      p90_seconds REAL NOT NULL,
+      updated_at TEXT NOT NULL,
+      PRIMARY KEY (program_id, machine_name)
+    );
+
+    -- Quantiles start at the mean and mean + 1.2816 sd (normal p90), so the ETA
+    -- bound is meaningful before enough completions have moved the estimates.
+    INSERT OR IGNORE INTO duration_stats
+    SELECT program_id, machine_name, n, mean, m2, mean, mean + 1.2816 * sqrt(m2 / MAX(n - 1, 1)), datetime('now')
+    FROM (
+    SELECT program_id, machine_name, COUNT(*) AS n, AVG(d) AS mean, MAX(SUM(d * d) - COUNT(*) * AVG(d) * AVG(d), 0) AS m2
+    FROM (
+      SELECT program_id, machine_name, strftime('%s', finished_at) - strftime('%s', started_at) AS d
+      FROM jobs WHERE status = 'completed' AND started_at IS NOT NULL AND finished_at IS NOT NULL AND machine_name IS NOT NULL
+      UNION ALL
+      SELECT program_id, machine_name, strftime('%s', finished_at) - strftime('%s', started_at)
+      FROM jobs_archive WHERE status = 'completed' AND started_at IS NOT NULL AND finished_at IS NOT NULL AND machine_name IS NOT NULL
+    )
+    GROUP BY program_id, machine_name
+    );
+
+    INSERT OR IGNORE INTO duration_stats
+    SELECT program_id, '', n, mean, m2, mean, mean + 1.2816 * sqrt(m2 / MAX(n - 1, 1)), datetime('now')
+    FROM (
+    SELECT program_id, COUNT(*) AS n, AVG(d) AS mean, MAX(SUM(d * d) - COUNT(*) * AVG(d) * AVG(d), 0) AS m2
+    FROM (
+      SELECT program_id, strftime('%s', finished_at) - strftime('%s', started_at) AS d
+      FROM jobs WHERE status = 'completed' AND started_at IS NOT NULL AND finished_at IS NOT NULL
+      UNION ALL
+      SELECT program_id, strftime('%s', finished_at) - strftime('%s', started_at)
+      FROM jobs_archive WHERE status = 'completed' AND started_at IS NOT NULL AND finished_at IS NOT NULL
+    )
+    GROUP BY program_id
+    );
+    """,
+    4: """
+    -- Time a started job spent paused, subtracted from its learned cycle time.
+    -- paused_at is set while a pause is open; rows go away when the job finishes.
+    CREATE TABLE IF NOT EXISTS job_pauses (
+      job_id INTEGER PRIMARY KEY,
+      paused_at TEXT,
+      paused_seconds REAL NOT NULL DEFAULT 0
+    );
+    """,
+}
+
+# Predicted cycle time of job ``j``: learned machine stats, then learned
+# program-wide stats, then the typed-in estimate. Both lookups are primary-key
+# joins, so predicting is O(1) per job. Expects ``sm``/``sp`` joined as below.
+_PREDICTION_JOINS = """
+LEFT JOIN duration_stats sm ON sm.program_id = j.program_id AND sm.machine_name = {machine}
+LEFT JOIN duration_stats sp ON sp.program_id = j.program_id AND sp.machine_name = ''
+"""
+# Whose cycle times rank a job: queued ones with the dispatching machine's, as the
+# worker does, others with the machine they ran on
+_PREDICTION_MACHINE_SQL = "CASE WHEN j.status = 'queued' THEN :machine_name ELSE COALESCE(j.machine_name, '') END"
+_PREDICTED_SQL = f"""COALESCE(
+  CASE WHEN sm.sample_count >= {DURATION_MIN_SAMPLES} THEN sm.mean_seconds END,
+  CASE WHEN sp.sample_count >= {DURATION_MIN_SAMPLES} THEN sp.mean_seconds END,
+  p.estimated_duration_seconds
+)"""
+# Same chain with the 90th percentile, for pessimistic ETAs
+_PREDICTED_P90_SQL = f"""COALESCE(
+  CASE WHEN sm.sample_count >= {DURATION_MIN_SAMPLES} THEN sm.p90_seconds END,
+  CASE WHEN sp.sample_count >= {DURATION_MIN_SAMPLES} THEN sp.p90_seconds END,
+  p.estimated_duration_seconds
+)"""
+# Shortest predicted job first within a priority, with time already spent waiting
+# credited against the prediction so long jobs are not starved by newcomers.
+# Without any predictions every job weighs the same and this is plain FIFO.
+# The key is computed per row, so no index serves it: ix_jobs_dispatch only filters
+# to status = 'queued' and each poll costs O(queued jobs), not O(1).
+_DISPATCH_ORDER_SQL = f"""
+j.priority ASC,
+COALESCE({_PREDICTED_SQL}, :fallback) - (julianday(:now) - julianday(j.queued_at)) * 86400 ASC,
+j.queued_at ASC,
+j.id ASC
+"""
+
+
 def init_db() -> None:
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with _connect() as conn:
-        conn.executescript(
-            """
-            PRAGMA journal_mode=WAL;
-            CREATE TABLE IF NOT EXISTS programs (
-              id INTEGER PRIMARY KEY AUTOINCREMENT,
-              name TEXT UNIQUE NOT NULL,
-              code_text TEXT NOT NULL,
-              estimated_duration_seconds INTEGER,
-              created_at TEXT NOT NULL,
-              updated_at TEXT NOT NULL
-            );
-
-            CREATE TABLE IF NOT EXISTS jobs (
-              id INTEGER PRIMARY KEY AUTOINCREMENT,
-              program_id INTEGER NOT NULL,
-              status TEXT NOT NULL,
-              priority INTEGER NOT NULL,
-              queued_at TEXT NOT NULL,
-              started_at TEXT,
-              finished_at TEXT,
-              machine_name TEXT,
-              error_message TEXT,
-              FOREIGN KEY(program_id) REFERENCES programs(id)
-            );
-            """
-        )
-        conn.commit()
+    """Create or migrate the schema. Idempotent, and only touches the file once per process.
+
+    ``PRAGMA user_version`` records the applied schema version, so a second
+    process (web app and worker) sees an up-to-date file and skips the DDL.
+    """
+    global _schema_ready
+    if _schema_ready:
+        return
+    with _schema_lock:
+        if _schema_ready:
+            return
+        DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with _connect() as conn:
+            current = conn.execute("PRAGMA user_version").fetchone()[0]
+            if current < SCHEMA_VERSION:
+                # sqrt() is only built into SQLite compiled with math functions
+                conn.create_function("sqrt", 1, math.sqrt, deterministic=True)
+                # WAL mode is persistent in the file, so it only needs setting on creation
+                conn.execute("PRAGMA journal_mode=WAL")
+                for version in range(current + 1, SCHEMA_VERSION + 1):
+                    conn.executescript(_MIGRATIONS[version])
+                    conn.execute(f"PRAGMA user_version = {version}")
+                conn.commit()
+        _schema_ready = True
 
 
 # Program operations
@@ -92,17 +268,50 @@ def find_program_by_name(name: str) -> Optional[Dict[str, Any]]:
 
 # Job operations
 
-def list_jobs() -> List[Dict[str, Any]]:
+def list_jobs(machine_name: Optional[str] = None) -> List[Dict[str, Any]]:
+    """All hot jobs with ``predicted_duration_seconds`` and, for queued ones, ``eta_seconds``.
+
+    The ETA assumes a single machine, ``machine_name``: what is left of the
+    running jobs plus the predictions of every queued job ahead in the order
+    :func:`get_next_queued_job` would dispatch them for that machine.
+    ``eta_p90_seconds`` is the same sum over 90th percentiles, an upper bound
+    for when everything ahead runs long.
+    """
+    now = datetime.utcnow()
     with _connect() as conn:
         rows = conn.execute(
-            """
-            SELECT j.*, p.name AS program_name
+            f"""
+            SELECT j.*, p.name AS program_name,
+              {_PREDICTED_SQL} AS predicted_duration_seconds,
+              {_PREDICTED_P90_SQL} AS predicted_p90_seconds,
+              CASE WHEN j.status = 'queued'
+                THEN ROW_NUMBER() OVER (PARTITION BY j.status = 'queued' ORDER BY {_DISPATCH_ORDER_SQL})
+              END AS dispatch_rank
             FROM jobs j
             JOIN programs p ON p.id = j.program_id
+            {_PREDICTION_JOINS.format(machine=_PREDICTION_MACHINE_SQL)}
             ORDER BY j.status, j.priority, j.queued_at
-            """
+            """,
+            {"machine_name": machine_name or "", "now": now.isoformat(), "fallback": DURATION_FALLBACK_SECONDS},
         ).fetchall()
-        return [dict(r) for r in rows]
+        jobs = [dict(r) for r in rows]
+
+    ahead = ahead_p90 = 0.0
+    for job in jobs:
+        if job["status"] == "running" and job["started_at"]:
+            elapsed = (now - datetime.fromisoformat(job["started_at"])).total_seconds()
+            ahead += max((job["predicted_duration_seconds"] or DURATION_FALLBACK_SECONDS) - elapsed, 0.0)
+            ahead_p90 += max((job["predicted_p90_seconds"] or DURATION_FALLBACK_SECONDS) - elapsed, 0.0)
+    queued = sorted((j for j in jobs if j["dispatch_rank"] is not None), key=lambda j: j["dispatch_rank"])
+    for job in jobs:
+        job["eta_seconds"] = job["eta_p90_seconds"] = None
+        # Internal to the ETA sum, not part of the job
+        del job["dispatch_rank"]
+    for job in queued:
+        job["eta_seconds"], job["eta_p90_seconds"] = ahead, ahead_p90
+        ahead += job["predicted_duration_seconds"] or DURATION_FALLBACK_SECONDS
+        ahead_p90 += job["predicted_p90_seconds"] or DURATION_FALLBACK_SECONDS
+    return jobs
 
 
 def enqueue_job(program_id: int, priority: int = 100) -> int:
@@ -125,35 +334,166 @@ def get_job(job_id: int) -> Optional[Dict[str, Any]]:
         return dict(row) if row else None
 
 
-def update_job_status(job_id: int, status: str, *, machine_name: Optional[str] = None, error_message: Optional[str] = None) -> None:
-    now = datetime.utcnow().isoformat()
-    with _connect() as conn:
-        if status == "running":
-            conn.execute(
-                "UPDATE jobs SET status = ?, started_at = ?, machine_name = ?, error_message = NULL WHERE id = ?",
-                (status, now, machine_name, job_id),
-            )
-        elif status in ("completed", "failed", "canceled"):
+def _apply_status_update(
+    conn: sqlite3.Connection,
+    job_id: int,
+    status: str,
+    now: str,
+    machine_name: Optional[str],
+    error_message: Optional[str],
+) -> None:
+    if status == "running":
+        conn.execute(
+            "UPDATE jobs SET status = ?, started_at = ?, machine_name = ?, error_message = NULL WHERE id = ?",
+            (status, now, machine_name, job_id),
+        )
+        # A fresh start, so pauses before it no longer count
+        conn.execute("DELETE FROM job_pauses WHERE job_id = ?", (job_id,))
+    elif status in TERMINAL_STATUSES:
+        conn.execute(
+            "UPDATE jobs SET status = ?, finished_at = ?, error_message = COALESCE(?, error_message) WHERE id = ?",
+            (status, now, error_message, job_id),
+        )
+        if status == "completed":
+            _record_duration(conn, job_id, now)
+        conn.execute("DELETE FROM job_pauses WHERE job_id = ?", (job_id,))
+    else:
+        conn.execute("UPDATE jobs SET status = ? WHERE id = ?", (status, job_id))
+        if status == "paused":
             conn.execute(
-                "UPDATE jobs SET status = ?, finished_at = ?, error_message = COALESCE(?, error_message) WHERE id = ?",
-                (status, now, error_message, job_id),
+                """
+                INSERT INTO job_pauses(job_id, paused_at) VALUES (?, ?)
+                ON CONFLICT(job_id) DO UPDATE SET paused_at = COALESCE(paused_at, excluded.paused_at)
+                """,
+                (job_id, now),
             )
         else:
-            conn.execute("UPDATE jobs SET status = ? WHERE id = ?", (status, job_id))
+            _close_pause(conn, job_id, now)
+
+
+def _close_pause(conn: sqlite3.Connection, job_id: int, now: str) -> None:
+    """Add an open pause of ``job_id`` to its paused total (resume keeps the adapter running)."""
+    conn.execute(
+        """
+        UPDATE job_pauses
+        SET paused_seconds = paused_seconds + (julianday(?) - julianday(paused_at)) * 86400, paused_at = NULL
+        WHERE job_id = ? AND paused_at IS NOT NULL
+        """,
+        (now, job_id),
+    )
+
+
+def _record_duration(conn: sqlite3.Connection, job_id: int, finished_at: str) -> None:
+    """Fold a completed job's cycle time, less the time it sat paused, into its machine and program-wide stats."""
+    job = conn.execute("SELECT program_id, machine_name, started_at FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    if not job or not job["started_at"]:
+        return
+    _close_pause(conn, job_id, finished_at)
+    pause = conn.execute("SELECT paused_seconds FROM job_pauses WHERE job_id = ?", (job_id,)).fetchone()
+    duration = (datetime.fromisoformat(finished_at) - datetime.fromisoformat(job["started_at"])).total_seconds()
+    duration -= pause["paused_seconds"] if pause else 0.0
+    for machine_name in {job["machine_name"] or "", ""}:
+        row = conn.execute(
+            "SELECT * FROM duration_stats WHERE program_id = ? AND machine_name = ?",
+            (job["program_id"], machine_name),
+        ).fetchone()
+        stats = _updated_duration_stats(dict(row) if row else None, duration)
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO duration_stats
+              (program_id, machine_name, sample_count, mean_seconds, m2, p50_seconds, p90_seconds, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                job["program_id"],
+                machine_name,
+                stats["sample_count"],
+                stats["mean_seconds"],
+                stats["m2"],
+                stats["p50_seconds"],
+                stats["p90_seconds"],
+                finished_at,
+            ),
+        )
+
+
+def _updated_duration_stats(stats: Optional[Dict[str, Any]], x: float) -> Dict[str, Any]:
+    """One O(1) update step: Welford for mean/variance, stochastic approximation for quantiles.
+
+    Each quantile estimate moves up by ``p * step`` when ``x`` lands above it
+    and down by ``(1 - p) * step`` otherwise, which settles where a fraction
+    ``p`` of the samples fall below. The step shrinks as 1/sqrt(n) and scales
+    with the observed spread, so it adapts to both short and long programs.
+    """
+    if not stats:
+        return {"sample_count": 1, "mean_seconds": x, "m2": 0.0, **{k: x for k in DURATION_QUANTILES}}
+    n = stats["sample_count"] + 1
+    delta = x - stats["mean_seconds"]
+    mean = stats["mean_seconds"] + delta / n
+    m2 = stats["m2"] + delta * (x - mean)
+    spread = max(math.sqrt(m2 / (n - 1)), 1.0)
+    step = 2.0 * spread / math.sqrt(n)
+    updated = {"sample_count": n, "mean_seconds": mean, "m2": m2}
+    for key, p in DURATION_QUANTILES.items():
+        q = stats[key]
+        updated[key] = q + step * (p - (1.0 if x <= q else 0.0))
+    return updated
+
+
+def update_job_status_direct(job_id: int, status: str, *, machine_name: Optional[str] = None, error_message: Optional[str] = None) -> None:
+    """One connection and one commit (fsync) per transition; kept as the baseline for benchmarks."""
+    now = datetime.utcnow().isoformat()
+    with closing(_connect()) as conn:
+        _apply_status_update(conn, job_id, status, now, machine_name, error_message)
         conn.commit()
 
 
-def get_next_queued_job() -> Optional[Dict[str, Any]]:
+def update_job_status_async(job_id: int, status: str, *, machine_name: Optional[str] = None, error_message: Optional[str] = None) -> Future:
+    """Queue a transition on the process-wide :class:`StatusWriter`.
+
+    The returned future resolves once the transition is committed.
+    """
+    return get_status_writer().submit(job_id, status, machine_name=machine_name, error_message=error_message)
+
+
+def update_job_status(job_id: int, status: str, *, machine_name: Optional[str] = None, error_message: Optional[str] = None) -> None:
+    """Apply a transition and block until it is durable.
+
+    A lone caller commits inline on its own thread; concurrent callers share
+    a commit through the status writer, so the cost of an fsync is spread
+    over every transition in the window.
+    """
+    get_status_writer().apply(job_id, status, machine_name=machine_name, error_message=error_message)
+
+
+def get_next_queued_job(machine_name: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Next job to dispatch, ranked with the cycle times learned for ``machine_name``."""
     with _connect() as conn:
         row = conn.execute(
-            """
-            SELECT j.*, p.name AS program_name, p.code_text, p.estimated_duration_seconds
+            f"""
+            SELECT j.*, p.name AS program_name, p.code_text, p.estimated_duration_seconds,
+              {_PREDICTED_SQL} AS predicted_duration_seconds
             FROM jobs j
             JOIN programs p ON p.id = j.program_id
+            {_PREDICTION_JOINS.format(machine=_PREDICTION_MACHINE_SQL)}
             WHERE j.status = 'queued'
-            ORDER BY j.priority ASC, j.queued_at ASC, j.id ASC
+            ORDER BY {_DISPATCH_ORDER_SQL}
             LIMIT 1
-            """
+            """,
+            {
+                "machine_name": machine_name or "",
+                "now": datetime.utcnow().isoformat(),
+                "fallback": DURATION_FALLBACK_SECONDS,
+            },
+        ).fetchone()
+        return dict(row) if row else None
+
+
+def get_duration_stats(program_id: int, machine_name: str = "") -> Optional[Dict[str, Any]]:
+    with _connect() as conn:
+        row = conn.execute(
+            "SELECT * FROM duration_stats WHERE program_id = ? AND machine_name = ?",
+            (program_id, machine_name),
         ).fetchone()
         return dict(row) if row else None
 
@@ -165,16 +505,30 @@ def get_job_status(job_id: int) -> Optional[str]:
 
 
 # Reports
+#
+# Archived jobs only exist as ``job_rollups`` aggregates (plus raw rows in
+# ``jobs_archive`` for history), so totals combine the hot table with rollups.
 
 def summary_counts_and_avg() -> Dict[str, Any]:
     with _connect() as conn:
         counts_rows = conn.execute(
-            "SELECT status, COUNT(id) FROM jobs GROUP BY status"
+            """
+            SELECT status, SUM(n) FROM (
+              SELECT status, COUNT(id) AS n FROM jobs GROUP BY status
+              UNION ALL
+              SELECT status, SUM(job_count) AS n FROM job_rollups GROUP BY status
+            )
+            GROUP BY status
+            """
         ).fetchall()
         avg_row = conn.execute(
             """
-            SELECT AVG(strftime('%s', finished_at) - strftime('%s', started_at))
-            FROM jobs WHERE finished_at IS NOT NULL AND started_at IS NOT NULL
+            SELECT SUM(total) * 1.0 / SUM(n) FROM (
+              SELECT SUM(strftime('%s', finished_at) - strftime('%s', started_at)) AS total, COUNT(id) AS n
+              FROM jobs WHERE finished_at IS NOT NULL AND started_at IS NOT NULL
+              UNION ALL
+              SELECT SUM(duration_total_seconds) AS total, SUM(duration_count) AS n FROM job_rollups
+            )
             """
         ).fetchone()
         return {
@@ -186,13 +540,248 @@ def summary_counts_and_avg() -> Dict[str, Any]:
 def recent_jobs(limit: int = 50) -> List[Dict[str, Any]]:
     with _connect() as conn:
         rows = conn.execute(
-            """
-            SELECT j.*, p.name AS program_name
-            FROM jobs j
-            JOIN programs p ON p.id = j.program_id
-            ORDER BY j.queued_at DESC
-            LIMIT ?
+            f"""
+            SELECT r.*, p.name AS program_name
+            FROM (
+              SELECT * FROM (SELECT {_JOB_COLUMNS} FROM jobs ORDER BY queued_at DESC LIMIT :limit)
+              UNION ALL
+              SELECT * FROM (SELECT {_JOB_COLUMNS} FROM jobs_archive ORDER BY queued_at DESC LIMIT :limit)
+            ) r
+            JOIN programs p ON p.id = r.program_id
+            ORDER BY r.queued_at DESC
+            LIMIT :limit
             """,
-            (limit,),
+            {"limit": limit},
         ).fetchall()
-        return [dict(r) for r in rows]
\ No newline at end of file
+        return [dict(r) for r in rows]
+
+
+# Status writer
+
+_StatusUpdate = Tuple[int, str, str, Optional[str], Optional[str], Future]
+
+
+class StatusWriter:
+    """Single writer thread that group-commits job status transitions.
+
+    Callers enqueue transitions and get a future back. The thread takes
+    everything queued (plus whatever arrives within ``window_seconds``, up to
+    ``max_batch``), applies it in arrival order in one transaction and
+    resolves every future after the commit. A single FIFO
+    and a single writer keep transitions of the same job in submission order.
+
+    :meth:`apply` skips the thread hop when nothing is queued or being
+    committed, since there is nothing to share the commit with.
+    """
+
+    def __init__(self, window_seconds: float = GROUP_COMMIT_WINDOW_SECONDS, max_batch: int = GROUP_COMMIT_MAX_BATCH) -> None:
+        self.window_seconds = window_seconds
+        self.max_batch = max_batch
+        self._queue: "queue.Queue[Optional[_StatusUpdate]]" = queue.Queue()
+        # Submitted but not yet committed transitions, and whether a commit is in flight
+        self._cond = threading.Condition()
+        self._pending = 0
+        self._busy = False
+        self.batches_committed = 0
+        self.updates_committed = 0
+        self._thread = threading.Thread(target=self._run, name="StatusWriter", daemon=True)
+        self._thread.start()
+
+    def submit(self, job_id: int, status: str, *, machine_name: Optional[str] = None, error_message: Optional[str] = None) -> Future:
+        future: Future = Future()
+        # Timestamps are taken at submission, not at commit, so batching does not skew durations
+        now = datetime.utcnow().isoformat()
+        with self._cond:
+            self._pending += 1
+        self._queue.put((job_id, status, now, machine_name, error_message, future))
+        return future
+
+    def apply(self, job_id: int, status: str, *, machine_name: Optional[str] = None, error_message: Optional[str] = None) -> None:
+        """Commit a transition and block until it is durable."""
+        with self._cond:
+            inline = not self._pending and not self._busy
+            if inline:
+                self._busy = True
+        if not inline:
+            self.submit(job_id, status, machine_name=machine_name, error_message=error_message).result()
+            return
+        try:
+            update_job_status_direct(job_id, status, machine_name=machine_name, error_message=error_message)
+            self.batches_committed += 1
+            self.updates_committed += 1
+        finally:
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
+
+    def close(self) -> None:
+        """Commit everything already submitted and stop the thread."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            closing_down = False
+            deadline = time.monotonic() + self.window_seconds
+            while len(batch) < self.max_batch:
+                try:
+                    remaining = deadline - time.monotonic()
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    closing_down = True
+                    break
+                batch.append(item)
+            # Let an inline commit that started before these were queued land first
+            with self._cond:
+                while self._busy:
+                    self._cond.wait()
+                self._busy = True
+            try:
+                self._commit(batch)
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._pending -= len(batch)
+                    self._cond.notify_all()
+            if closing_down:
+                return
+
+    def _commit(self, batch: List[_StatusUpdate]) -> None:
+        # Each transition gets its own savepoint, so one that fails is rolled back
+        # and reported on its own future while the rest of the batch still commits.
+        # A lone transition has nothing to be isolated from and skips the savepoint.
+        failures: Dict[int, Exception] = {}
+        try:
+            with closing(_connect()) as conn:
+                if len(batch) == 1:
+                    job_id, status, now, machine_name, error_message, _ = batch[0]
+                    _apply_status_update(conn, job_id, status, now, machine_name, error_message)
+                else:
+                    conn.execute("BEGIN")
+                    for i, (job_id, status, now, machine_name, error_message, _) in enumerate(batch):
+                        conn.execute("SAVEPOINT status_update")
+                        try:
+                            _apply_status_update(conn, job_id, status, now, machine_name, error_message)
+                        except Exception as exc:
+                            conn.execute("ROLLBACK TO status_update")
+                            failures[i] = exc
+                        conn.execute("RELEASE status_update")
+                conn.commit()
+        except Exception as exc:
+            for *_, future in batch:
+                future.set_exception(exc)
+            return
+        self.batches_committed += 1
+        self.updates_committed += len(batch) - len(failures)
+        for i, (*_, future) in enumerate(batch):
+            if i in failures:
+                future.set_exception(failures[i])
+            else:
+                future.set_result(None)
+
+
+_status_writer: Optional[StatusWriter] = None
+_status_writer_lock = threading.Lock()
+
+
+def get_status_writer() -> StatusWriter:
+    global _status_writer
+    if _status_writer is None:
+        with _status_writer_lock:
+            if _status_writer is None:
+                _status_writer = StatusWriter()
+                atexit.register(_status_writer.close)
+    return _status_writer
+
+
+# Archiving
+
+def archive_jobs(
+    retention_days: Optional[float] = None,
+    max_hot_terminal: Optional[int] = None,
+    batch_size: int = ARCHIVE_BATCH_SIZE,
+) -> int:
+    """Move one batch of finished jobs from ``jobs`` to ``jobs_archive``.
+
+    A job qualifies once it is terminal and either finished more than
+    ``retention_days`` ago or falls outside the newest ``max_hot_terminal``
+    finished rows. Copy, rollup and delete happen in one short transaction, so
+    callers can run this between polls; returns the number of rows moved and
+    is repeated until it returns 0 to drain a backlog.
+    """
+    retention_days = ARCHIVE_RETENTION_DAYS if retention_days is None else retention_days
+    max_hot_terminal = ARCHIVE_MAX_HOT_TERMINAL if max_hot_terminal is None else max_hot_terminal
+    now = datetime.utcnow()
+    cutoff = (now - timedelta(days=retention_days)).isoformat()
+    terminal = ", ".join(f"'{s}'" for s in TERMINAL_STATUSES)
+
+    conn = _connect()
+    try:
+        # IMMEDIATE takes the write lock up front so the batch cannot deadlock
+        # against a concurrent status update half-way through.
+        conn.execute("BEGIN IMMEDIATE")
+        ids = [
+            r[0]
+            for r in conn.execute(
+                f"""
+                SELECT id FROM jobs
+                WHERE status IN ({terminal})
+                  AND (
+                    finished_at < :cutoff
+                    OR finished_at <= COALESCE(
+                      (SELECT finished_at FROM jobs WHERE status IN ({terminal})
+                       ORDER BY finished_at DESC LIMIT 1 OFFSET :keep),
+                      '')
+                  )
+                ORDER BY finished_at
+                LIMIT :batch
+                """,
+                {"cutoff": cutoff, "keep": max_hot_terminal, "batch": batch_size},
+            )
+        ]
+        if not ids:
+            conn.rollback()
+            return 0
+
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS archive_batch (id INTEGER PRIMARY KEY)")
+        conn.execute("DELETE FROM archive_batch")
+        conn.executemany("INSERT INTO archive_batch(id) VALUES (?)", [(i,) for i in ids])
+        conn.execute(
+            f"""
+            INSERT INTO jobs_archive({_JOB_COLUMNS}, archived_at)
+            SELECT {_JOB_COLUMNS}, ? FROM jobs WHERE id IN (SELECT id FROM archive_batch)
+            """,
+            (now.isoformat(),),
+        )
+        conn.execute(
+            """
+            INSERT INTO job_rollups(day, status, job_count, duration_total_seconds, duration_count)
+            SELECT
+              substr(finished_at, 1, 10),
+              status,
+              COUNT(id),
+              COALESCE(SUM(strftime('%s', finished_at) - strftime('%s', started_at)), 0),
+              COUNT(started_at)
+            FROM jobs
+            WHERE id IN (SELECT id FROM archive_batch)
+            GROUP BY 1, 2
+            ON CONFLICT(day, status) DO UPDATE SET
+              job_count = job_count + excluded.job_count,
+              duration_total_seconds = duration_total_seconds + excluded.duration_total_seconds,
+              duration_count = duration_count + excluded.duration_count
+            """
+        )
+        conn.execute("DELETE FROM jobs WHERE id IN (SELECT id FROM archive_batch)")
+        conn.commit()
+        return len(ids)
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
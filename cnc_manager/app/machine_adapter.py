@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import os
 import random
 import time
 from typing import Optional
 
+# The machine the worker dispatches for; the dashboard ranks the queue with its cycle times
+DEFAULT_MACHINE_NAME = os.environ.get("CNC_MACHINE_NAME", "MockCNC-01")
+
 
 class MockCNCAdapter:
     """A mock CNC machine that simulates job execution.
@@ -11,7 +15,7 @@ class MockCNCAdapter:
     In a real integration, replace methods here with actual CNC controller API calls.
     """
 
-    def __init__(self, machine_name: str = "MockCNC-01") -> None:
+    def __init__(self, machine_name: str = DEFAULT_MACHINE_NAME) -> None:
         self.machine_name = machine_name
 
     def estimate_duration_seconds(self, estimated: Optional[int], code_text: str) -> int:
@@ -1,33 +1,55 @@
 from __future__ import annotations
 
+import os
 from pathlib import Path
-from flask import Flask, render_template, request, redirect, url_for, jsonify
+from typing import Optional
+
+from flask import Blueprint, Flask, render_template, request, redirect, url_for, jsonify
 
-from .worker import QueueWorker
 from . import db
+from .machine_adapter import DEFAULT_MACHINE_NAME
+
+bp = Blueprint("cnc", __name__)
+
 
-app = Flask(__name__, template_folder=str(Path(__file__).parent / "templates"), static_folder=str(Path(__file__).parent / "static"))
+def create_app(start_worker: Optional[bool] = None) -> Flask:
+    """Application factory, picked up by ``flask --app app.main``.
 
-worker = QueueWorker()
+    The schema is initialized here, once per process, instead of on the first
+    request. The queue worker runs in-process unless ``start_worker`` is false
+    or ``CNC_START_WORKER=0`` is set, in which case it is expected to run as its
+    own process (``python3 -m app.worker``).
+    """
+    app = Flask(__name__, template_folder=str(Path(__file__).parent / "templates"), static_folder=str(Path(__file__).parent / "static"))
+    app.register_blueprint(bp)
 
-@app.before_first_request
-def setup() -> None:
     db.init_db()
-    worker.start()
+
+    if start_worker is None:
+        start_worker = os.environ.get("CNC_START_WORKER", "1") != "0"
+    # The debug reloader imports the app in a watcher process too; only the
+    # serving child (WERKZEUG_RUN_MAIN set) should dispatch jobs.
+    if start_worker and (not app.debug or os.environ.get("WERKZEUG_RUN_MAIN") == "true"):
+        from .worker import QueueWorker
+
+        worker = QueueWorker()
+        worker.start()
+        app.extensions["cnc_worker"] = worker
+    return app
 
 
-@app.route("/")
+@bp.route("/")
 def root():
-    return redirect(url_for("jobs_dashboard"))
+    return redirect(url_for(".jobs_dashboard"))
 
 
-@app.route("/programs/", methods=["GET"])
+@bp.route("/programs/", methods=["GET"])
 def programs_list_page():
     programs = db.list_programs()
     return render_template("programs.html", programs=programs)
 
 
-@app.route("/programs/create", methods=["POST"])
+@bp.route("/programs/create", methods=["POST"])
 def create_program_form():
     name = request.form.get("name", type=str)
     code_text = request.form.get("code_text", type=str)
@@ -36,39 +58,39 @@ def create_program_form():
     if existing:
         return ("Program exists", 400)
     db.create_program(name=name, code_text=code_text, estimated_duration_seconds=estimated)
-    return redirect(url_for("programs_list_page"))
+    return redirect(url_for(".programs_list_page"))
 
 
-@app.route("/programs/api", methods=["GET"])
+@bp.route("/programs/api", methods=["GET"])
 def programs_api_list():
     programs = db.list_programs()
     return jsonify(programs)
 
 
-@app.route("/jobs/", methods=["GET"])
+@bp.route("/jobs/", methods=["GET"])
 def jobs_dashboard():
-    jobs = db.list_jobs()
+    jobs = db.list_jobs(machine_name=DEFAULT_MACHINE_NAME)
     programs = db.list_programs()
     return render_template("dashboard.html", jobs=jobs, programs=programs)
 
 
-@app.route("/jobs/enqueue", methods=["POST"])
+@bp.route("/jobs/enqueue", methods=["POST"])
 def enqueue_job_from_form():
     program_id = request.form.get("program_id", type=int)
     priority = request.form.get("priority", default=100, type=int)
     if not db.get_program(program_id):
         return ("Program not found", 404)
     db.enqueue_job(program_id=program_id, priority=priority)
-    return redirect(url_for("jobs_dashboard"))
+    return redirect(url_for(".jobs_dashboard"))
 
 
-@app.route("/jobs/api", methods=["GET"]) 
+@bp.route("/jobs/api", methods=["GET"]) 
 def jobs_api_list():
-    jobs = db.list_jobs()
+    jobs = db.list_jobs(machine_name=DEFAULT_MACHINE_NAME)
     return jsonify(jobs)
 
 
-@app.route("/jobs/<int:job_id>/pause", methods=["POST"]) 
+@bp.route("/jobs/<int:job_id>/pause", methods=["POST"]) 
 def pause_job(job_id: int):
     job = db.get_job(job_id)
     if not job:
@@ -76,10 +98,10 @@ def pause_job(job_id: int):
     if job["status"] not in ("running", "queued"):
         return ("Invalid state", 400)
     db.update_job_status(job_id, "paused")
-    return redirect(url_for("jobs_dashboard"))
+    return redirect(url_for(".jobs_dashboard"))
 
 
-@app.route("/jobs/<int:job_id>/resume", methods=["POST"]) 
+@bp.route("/jobs/<int:job_id>/resume", methods=["POST"]) 
 def resume_job(job_id: int):
     job = db.get_job(job_id)
     if not job:
@@ -87,10 +109,10 @@ def resume_job(job_id: int):
     if job["status"] != "paused":
         return ("Invalid state", 400)
     db.update_job_status(job_id, "queued")
-    return redirect(url_for("jobs_dashboard"))
+    return redirect(url_for(".jobs_dashboard"))
 
 
-@app.route("/jobs/<int:job_id>/cancel", methods=["POST"]) 
+@bp.route("/jobs/<int:job_id>/cancel", methods=["POST"]) 
 def cancel_job(job_id: int):
     job = db.get_job(job_id)
     if not job:
@@ -98,10 +120,10 @@ def cancel_job(job_id: int):
     if job["status"] in ("completed", "failed", "canceled"):
         return ("Already finished", 400)
     db.update_job_status(job_id, "canceled")
-    return redirect(url_for("jobs_dashboard"))
+    return redirect(url_for(".jobs_dashboard"))
 
 
-@app.route("/reports/", methods=["GET"]) 
+@bp.route("/reports/", methods=["GET"]) 
 def reports_page():
     summary = db.summary_counts_and_avg()
     recent = db.recent_jobs(limit=50)
@@ -109,4 +131,5 @@ def reports_page():
 
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=8000, debug=True)
\ No newline at end of file
+    # No reloader here: it would start a second in-process worker in the watcher process
+    create_app().run(host="0.0.0.0", port=8000, debug=True, use_reloader=False)
\ No newline at end of file
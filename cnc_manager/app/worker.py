@@ -1,29 +1,56 @@
 from __future__ import annotations
 
-import threading
 import time
+
+# Captured before the remaining imports so cold-start timings include them
+PROCESS_STARTED = time.monotonic()
+
+import argparse
+import logging
+import signal
+import threading
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional
 
 from . import db
 from .machine_adapter import MockCNCAdapter
 
+logger = logging.getLogger(__name__)
+
 
 class QueueWorker:
-    def __init__(self, poll_interval_seconds: float = 1.0) -> None:
+    def __init__(self, poll_interval_seconds: float = 1.0, archive_interval_seconds: float = 60.0) -> None:
         self.poll_interval_seconds = poll_interval_seconds
+        self.archive_interval_seconds = archive_interval_seconds
+        self._next_archive_at = 0.0
         self._thread: Optional[threading.Thread] = None
         self._stop_event = threading.Event()
         self._adapter = MockCNCAdapter()
+        # Seconds since process start at which each startup milestone was reached
+        self.startup_timings: Dict[str, float] = {}
+
+    def _mark(self, milestone: str) -> None:
+        if milestone not in self.startup_timings:
+            self.startup_timings[milestone] = time.monotonic() - PROCESS_STARTED
+            logger.info("worker %s after %.3f s", milestone, self.startup_timings[milestone])
 
     def start(self) -> None:
+        """Run the polling loop on a background thread (in-process with the web app)."""
         if self._thread and self._thread.is_alive():
             return
         db.init_db()
+        self._mark("schema_ready")
         self._stop_event.clear()
         self._thread = threading.Thread(target=self._run_loop, name="QueueWorker", daemon=True)
         self._thread.start()
 
+    def run(self) -> None:
+        """Run the polling loop in the calling thread until :meth:`stop` is called."""
+        db.init_db()
+        self._mark("schema_ready")
+        self._stop_event.clear()
+        self._run_loop()
+
     def stop(self) -> None:
         self._stop_event.set()
         if self._thread:
@@ -33,20 +60,40 @@ class QueueWorker:
         while not self._stop_event.is_set():
             try:
                 self._process_once()
+                self._maybe_archive()
             except Exception:
-                time.sleep(self.poll_interval_seconds)
-            time.sleep(self.poll_interval_seconds)
+                logger.exception("worker iteration failed")
+                self._stop_event.wait(self.poll_interval_seconds)
+            self._stop_event.wait(self.poll_interval_seconds)
+
+    def _maybe_archive(self) -> None:
+        """Archive at most one small batch per poll, so dispatch is never held up for long.
+
+        While a backlog remains the next batch runs on the following poll;
+        once drained the worker waits ``archive_interval_seconds``.
+        """
+        if time.monotonic() < self._next_archive_at:
+            return
+        moved = db.archive_jobs()
+        if moved:
+            logger.info("archived %d finished jobs", moved)
+        else:
+            self._next_archive_at = time.monotonic() + self.archive_interval_seconds
 
     def _process_once(self) -> None:
-        next_job = db.get_next_queued_job()
+        next_job = db.get_next_queued_job(machine_name=self._adapter.machine_name)
+        self._mark("first_poll")
         if not next_job:
             return
 
         job_id = next_job["id"]
         program_code = next_job["code_text"]
-        est = next_job.get("estimated_duration_seconds")
+        # Learned cycle time when there is one, otherwise the typed-in estimate
+        predicted = next_job.get("predicted_duration_seconds")
+        est = int(round(predicted)) if predicted is not None else None
 
         db.update_job_status(job_id, "running", machine_name=self._adapter.machine_name)
+        self._mark("first_dispatch")
 
         def check_state() -> str:
             status = db.get_job_status(job_id)
@@ -67,4 +114,27 @@ class QueueWorker:
                 db.update_job_status(job_id, "canceled", error_message=str(exc))
             return
 
-        db.update_job_status(job_id, "completed")
\ No newline at end of file
+        db.update_job_status(job_id, "completed")
+
+
+def main() -> None:
+    """Standalone worker process: ``python3 -m app.worker``.
+
+    Imports only the sqlite layer and the machine adapter, never Flask or Jinja,
+    so it reaches its first dispatch without paying for the web stack.
+    """
+    parser = argparse.ArgumentParser(prog="python3 -m app.worker", description="CNC queue worker")
+    parser.add_argument("--poll-interval", type=float, default=1.0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    worker = QueueWorker(poll_interval_seconds=args.poll_interval)
+    signal.signal(signal.SIGTERM, lambda *_: worker.stop())
+    try:
+        worker.run()
+    except KeyboardInterrupt:
+        worker.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import argparse
+import time
+from typing import List, Optional
+
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+
+from .cache import load_features
+from .search import MODEL_SPECS, SEARCH_STRATEGIES, SearchResult, run_all
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python3 -m pipeline",
+        description="Hyperparameter search for the Spaceship Titanic models",
+    )
+    parser.add_argument("csv_path", help="path to train.csv from the Kaggle competition")
+    parser.add_argument("--models", nargs="+", choices=sorted(MODEL_SPECS), help="subset of models to tune")
+    parser.add_argument("--search", choices=SEARCH_STRATEGIES, default="grid", help="grid or successive halving")
+    parser.add_argument("--cv", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=None, help="process pool size (default: one per model, capped at CPU count)")
+    parser.add_argument("--cache-dir", default=None, help="where to memoize the feature matrix (default: next to the CSV)")
+    parser.add_argument("--test-size", type=float, default=0.2)
+    parser.add_argument("--random-state", type=int, default=42)
+    return parser.parse_args(argv)
+
+
+def print_report(results: List[SearchResult], total_seconds: float) -> None:
+    header = f"{'model':<22}{'time, s':>9}{'cv score':>10}{'test':>10}{'cands':>7}  best params"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        if r.error is not None:
+            print(f"{r.name:<22}{'failed':>9}  {r.error}")
+            continue
+        print(
+            f"{r.name:<22}{r.wall_time_seconds:>9.2f}{r.best_score:>10.4f}{r.test_score:>10.4f}"
+            f"{r.n_candidates:>7}  {r.best_params}"
+        )
+    print(f"\nTotal wall time: {total_seconds:.2f} s")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+
+    started = time.perf_counter()
+    matrix = load_features(args.csv_path, cache_dir=args.cache_dir)
+    print(
+        f"Features {matrix.X.shape} loaded in {time.perf_counter() - started:.2f} s "
+        f"({'cache hit' if matrix.cache_hit else 'built and cached'})"
+    )
+    if matrix.dropped_rows:
+        print(f"Dropped {matrix.dropped_rows} rows with features that could not be filled in")
+
+    X_train, X_test, y_train, y_test = train_test_split(
+        matrix.X, matrix.y, test_size=args.test_size, shuffle=True, random_state=args.random_state
+    )
+    # Fit the scaler on the train split only so the test score is not leaked
+    scaler = StandardScaler().fit(X_train)
+    datasets = {
+        True: (scaler.transform(X_train), y_train, scaler.transform(X_test), y_test),
+        False: (X_train, y_train, X_test, y_test),
+    }
+
+    search_started = time.perf_counter()
+    results = run_all(
+        datasets,
+        names=args.models,
+        strategy=args.search,
+        cv=args.cv,
+        max_workers=args.workers,
+        random_state=args.random_state,
+    )
+    print_report(results, time.perf_counter() - search_started)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Compare the notebook feature code with :class:`FeatureTransformer`.
+
+    python3 -m pipeline.bench_features path/to/train.csv --upsample 100
+
+The train CSV is repeated ``--upsample`` times into a temporary file and each
+variant is timed from CSV parse to finished feature frame. Peak memory is
+measured with ``tracemalloc`` (which sees numpy and pandas buffers) in a
+separate run, since tracing slows object-heavy code unevenly.
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import itertools
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .features import FeatureTransformer, clean_data, get_transform, read_frame
+
+
+def notebook_version(csv_path: Path) -> pd.DataFrame:
+    return get_transform(clean_data(pd.read_csv(csv_path, index_col=0)))
+
+
+def fused_version(csv_path: Path) -> pd.DataFrame:
+    return FeatureTransformer().fit_transform(read_frame(csv_path))
+
+
+def make_chunked_version(chunksize: int) -> Callable[[Path], pd.DataFrame]:
+    def chunked_version(csv_path: Path) -> pd.DataFrame:
+        # Fit on the first chunk only, as a streaming inference job would reuse a
+        # transformer fitted elsewhere; the output is reduced to a row count to
+        # keep just one chunk alive at a time.
+        chunks = read_frame(csv_path, chunksize=chunksize)
+        first = next(chunks)
+        transformer = FeatureTransformer().fit(first)
+        rows = sum(len(out) for out in transformer.transform_chunks(itertools.chain([first], chunks)))
+        return pd.DataFrame({"rows": [rows]})
+
+    return chunked_version
+
+
+def measure(fn: Callable[[Path], pd.DataFrame], csv_path: Path) -> Tuple[float, int]:
+    gc.collect()
+    started = time.perf_counter()
+    fn(csv_path)
+    elapsed = time.perf_counter() - started
+
+    gc.collect()
+    tracemalloc.start()
+    fn(csv_path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def check_equivalent(csv_path: Path) -> float:
+    """Max absolute difference between the two versions on the original CSV."""
+    expected = notebook_version(csv_path).astype("float64")
+    actual = fused_version(csv_path)
+    if list(expected.columns) != list(actual.columns):
+        raise AssertionError(f"Column mismatch: {list(expected.columns)} != {list(actual.columns)}")
+    diff = np.abs(expected.to_numpy() - actual.to_numpy(dtype="float64"))
+    if not np.array_equal(np.isnan(expected.to_numpy()), np.isnan(diff)):
+        raise AssertionError("Missing values differ between versions")
+    return float(np.nanmax(diff))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python3 -m pipeline.bench_features")
+    parser.add_argument("csv_path", type=Path)
+    parser.add_argument("--upsample", type=int, default=100)
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    print(f"Max abs difference on {args.csv_path.name}: {check_equivalent(args.csv_path):.2e}")
+
+    data = pd.read_csv(args.csv_path)
+    with tempfile.TemporaryDirectory() as tmp:
+        big_csv = Path(tmp) / "train_upsampled.csv"
+        pd.concat([data] * args.upsample, ignore_index=True).to_csv(big_csv, index=False)
+        del data
+        print(f"Upsampled x{args.upsample}: {big_csv.stat().st_size / 2**20:.1f} MiB\n")
+
+        variants = [
+            ("notebook clean_data+get_transform", notebook_version),
+            ("FeatureTransformer", fused_version),
+            (f"FeatureTransformer, chunks of {args.chunksize}", make_chunked_version(args.chunksize)),
+        ]
+        print(f"{'variant':<42}{'time, s':>10}{'peak, MiB':>12}")
+        baseline: Optional[Tuple[float, int]] = None
+        for label, fn in variants:
+            elapsed, peak = measure(fn, big_csv)
+            line = f"{label:<42}{elapsed:>10.2f}{peak / 2**20:>12.1f}"
+            if baseline is None:
+                baseline = (elapsed, peak)
+            else:
+                line += f"   x{baseline[0] / elapsed:.1f} faster, x{baseline[1] / peak:.1f} less memory"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
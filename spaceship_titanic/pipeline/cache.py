@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Union
+
+import numpy as np
+
+from .features import FEATURES_VERSION, TARGET_COLUMN, FeatureTransformer, read_frame
+
+PathLike = Union[str, Path]
+
+
+@dataclass
+class FeatureMatrix:
+    X: np.ndarray
+    y: np.ndarray
+    feature_names: List[str]
+    cache_hit: bool = False
+    # Rows left out because a feature or the target could not be filled in
+    dropped_rows: int = 0
+
+
+def input_hash(csv_path: PathLike) -> str:
+    """SHA-256 of the CSV bytes plus the feature code version."""
+    digest = hashlib.sha256()
+    digest.update(FEATURES_VERSION.encode())
+    with open(csv_path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def default_cache_dir(csv_path: PathLike) -> Path:
+    return Path(csv_path).resolve().parent / ".feature_cache"
+
+
+def build_features(csv_path: PathLike) -> FeatureMatrix:
+    """Encode ``csv_path`` and drop the rows that still hold a NaN.
+
+    Forward fill cannot fill leading missing categoricals or cabins, and values
+    outside the code maps encode as NaN; most estimators reject those inputs.
+    """
+    dataset = FeatureTransformer().fit_transform(read_frame(csv_path))
+    complete = ~dataset.isna().any(axis=1)
+    dropped_rows = int(len(dataset) - complete.sum())
+    if dropped_rows:
+        dataset = dataset[complete]
+    features = dataset.drop(TARGET_COLUMN, axis=1)
+    return FeatureMatrix(
+        X=features.to_numpy(dtype="float32"),
+        y=dataset[TARGET_COLUMN].to_numpy(dtype="int64"),
+        feature_names=[str(c) for c in features.columns],
+        dropped_rows=dropped_rows,
+    )
+
+
+def load_features(csv_path: PathLike, cache_dir: Optional[PathLike] = None) -> FeatureMatrix:
+    """Return the cleaned and encoded matrix for ``csv_path``, memoized on disk.
+
+    The cache file name is the input hash, so an edited CSV or a new
+    ``FEATURES_VERSION`` simply misses and writes a fresh entry.
+    """
+    cache_root = Path(cache_dir) if cache_dir is not None else default_cache_dir(csv_path)
+    cache_file = cache_root / f"{input_hash(csv_path)}.npz"
+    if cache_file.exists():
+        with np.load(cache_file, allow_pickle=False) as npz:
+            return FeatureMatrix(
+                X=npz["X"],
+                y=npz["y"],
+                feature_names=[str(n) for n in npz["feature_names"]],
+                cache_hit=True,
+                dropped_rows=int(npz["dropped_rows"]),
+            )
+
+    matrix = build_features(csv_path)
+    cache_root.mkdir(parents=True, exist_ok=True)
+    # Write to a temp name first so a concurrent reader never sees a partial file
+    tmp_file = cache_file.with_suffix(".tmp.npz")
+    np.savez(
+        tmp_file, X=matrix.X, y=matrix.y, feature_names=np.array(matrix.feature_names), dropped_rows=matrix.dropped_rows
+    )
+    tmp_file.replace(cache_file)
+    return matrix
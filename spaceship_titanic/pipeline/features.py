@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Bump when the feature logic below changes so cached matrices are rebuilt
+FEATURES_VERSION = "3"
+
+TARGET_COLUMN = "Transported_target"
+
+COST_COLUMNS = ["RoomService", "FoodCourt", "ShoppingMall", "Spa", "VRDeck"]
+
+COSTS_QUANTILES = [0, 0.5, 0.75, 0.85, 0.9, 0.95, 0.96, 0.98, 0.99, 1]
+
+# Columns are typed at parse time: low-cardinality strings become categoricals
+# and numbers float32, so the raw frame is a fraction of the default object/float64 one.
+CSV_DTYPES: Dict[str, Any] = {
+    "HomePlanet": "category",
+    "CryoSleep": "category",
+    "Cabin": "category",
+    "Destination": "category",
+    "VIP": "category",
+    "Transported": "category",
+    "Age": "float32",
+    **{column: "float32" for column in COST_COLUMNS},
+}
+
+BOOL_CODES = {False: 0, True: 1, "False": 0, "True": 1}
+CODE_MAPS: Dict[str, Mapping[Any, int]] = {
+    "HomePlanet": {"Earth": 0, "Europa": 1, "Mars": 2},
+    "CryoSleep": BOOL_CODES,
+    "Destination": {"TRAPPIST-1e": 0, "55 Cancri e": 1, "PSO J318.5-22": 2},
+    "VIP": BOOL_CODES,
+}
+FFILL_COLUMNS = ("CryoSleep", "Destination", "VIP", "HomePlanet", "Cabin")
+
+
+def read_frame(csv_path, chunksize: Optional[int] = None):
+    """Read the competition CSV with typed columns, skipping ``Name``.
+
+    With ``chunksize`` an iterator of frames is returned, ready for
+    :meth:`FeatureTransformer.transform_chunks`.
+    """
+    columns = pd.read_csv(csv_path, nrows=0).columns
+    dtypes = {c: t for c, t in CSV_DTYPES.items() if c in columns}
+    return pd.read_csv(
+        csv_path,
+        index_col=0,
+        usecols=[c for c in columns if c != "Name"],
+        dtype=dtypes,
+        chunksize=chunksize,
+    )
+
+
+def _ffill_codes(codes: np.ndarray) -> np.ndarray:
+    """Forward fill ``-1`` (missing) entries of a factorized column."""
+    idx = np.where(codes >= 0, np.arange(len(codes)), 0)
+    np.maximum.accumulate(idx, out=idx)
+    # Leading missing rows have nothing to fill from and stay -1
+    return codes[idx]
+
+
+def _factorize(series: pd.Series, ffill: bool, carry: Any = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Return ``(codes, uniques)`` with optional forward fill.
+
+    ``carry`` is the last valid value from a previous chunk and fills the
+    leading gap, so chunked and whole-frame results agree.
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    uniques = np.asarray(uniques, dtype=object)
+    if not ffill:
+        return codes, uniques
+    codes = _ffill_codes(codes)
+    if carry is not None and len(codes) and codes[0] < 0:
+        uniques = np.append(uniques, np.array([carry], dtype=object))
+        codes[codes < 0] = len(uniques) - 1
+    return codes, uniques
+
+
+def _lookup(codes: np.ndarray, uniques: np.ndarray, mapping: Mapping[Any, Any]) -> np.ndarray:
+    """Map factorized values through ``mapping``; missing and unknown become NaN.
+
+    Only the uniques go through Python, the per-row work is a single take.
+    """
+    table = np.array([mapping.get(u, np.nan) for u in uniques] + [np.nan], dtype="float32")
+    return table[codes]
+
+
+class FeatureTransformer:
+    """Fused, vectorized replacement for ``clean_data`` + ``get_transform``.
+
+    ``fit`` learns the statistics the notebook recomputed on every call (Age
+    mean, cost group edges, cabin letters); ``transform`` then works on any
+    frame or row chunk without mutating or copying its input. Output columns
+    match the notebook order and are all float32.
+    """
+
+    def __init__(self) -> None:
+        self.age_mean_: Optional[float] = None
+        self.cost_edges_: Optional[np.ndarray] = None
+        self.cabin_letters_: Optional[List[str]] = None
+
+    @staticmethod
+    def _total_costs(df: pd.DataFrame) -> np.ndarray:
+        costs = df[COST_COLUMNS].to_numpy(dtype="float32")
+        return np.nansum(costs, axis=1, dtype="float64")
+
+    @staticmethod
+    def _split_cabin(uniques: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Split ``deck/num/side`` once per distinct cabin instead of once per row."""
+        decks = np.full(len(uniques), None, dtype=object)
+        numbers = np.full(len(uniques) + 1, np.nan, dtype="float32")
+        sides = np.full(len(uniques), None, dtype=object)
+        for i, cabin in enumerate(uniques):
+            parts = str(cabin).split("/")
+            decks[i] = parts[0]
+            if len(parts) > 1 and parts[1].isdigit():
+                numbers[i] = int(parts[1])
+            if len(parts) > 2:
+                sides[i] = parts[2]
+        # ``numbers`` keeps a trailing NaN so it can be indexed with -1 codes directly
+        return decks, numbers, sides
+
+    def fit(self, df: pd.DataFrame) -> "FeatureTransformer":
+        self.age_mean_ = float(df["Age"].mean())
+        self.cost_edges_ = np.quantile(self._total_costs(df), COSTS_QUANTILES)
+        codes, uniques = _factorize(df["Cabin"], ffill=True)
+        decks, _, _ = self._split_cabin(uniques[np.unique(codes[codes >= 0])])
+        self.cabin_letters_ = sorted({d for d in decks if d is not None})
+        return self
+
+    def fit_transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        return self.fit(df).transform(df)
+
+    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        if self.age_mean_ is None:
+            raise RuntimeError("FeatureTransformer is not fitted")
+        return self._transform(df, {})[0]
+
+    def transform_chunks(self, chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """Transform a stream of row chunks, carrying forward-fill state between them."""
+        if self.age_mean_ is None:
+            raise RuntimeError("FeatureTransformer is not fitted")
+        carry: Dict[str, Any] = {}
+        for chunk in chunks:
+            out, carry = self._transform(chunk, carry)
+            yield out
+
+    def _transform(self, df: pd.DataFrame, carry: Dict[str, Any]) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        out: Dict[str, np.ndarray] = {}
+        next_carry: Dict[str, Any] = {}
+
+        age = df["Age"].to_numpy(dtype="float32")
+        out["Age"] = np.where(np.isnan(age) | (age == 0), np.float32(self.age_mean_), age)
+
+        # pd.cut(right=True, include_lowest=True) over the fitted edges; values past
+        # the fitted range (unseen in training) fall into the first/last group.
+        group = np.searchsorted(self.cost_edges_, self._total_costs(df), side="left")
+        out["Group_costs"] = np.clip(group, 1, len(self.cost_edges_) - 1).astype("float32")
+
+        factorized = {}
+        for column in FFILL_COLUMNS:
+            codes, uniques = _factorize(df[column], ffill=True, carry=carry.get(column))
+            factorized[column] = (codes, uniques)
+            if len(codes) and codes[-1] >= 0:
+                next_carry[column] = uniques[codes[-1]]
+            elif column in carry:
+                next_carry[column] = carry[column]
+
+        cabin_codes, cabin_uniques = factorized["Cabin"]
+        decks, numbers, sides = self._split_cabin(cabin_uniques)
+        out["Cabin_No"] = numbers[cabin_codes]
+        for column, mapping in CODE_MAPS.items():
+            out[f"{column}_code"] = _lookup(*factorized[column], mapping)
+        out["Cabin_type_code"] = _lookup(cabin_codes, sides, {"S": 0, "P": 1})
+        if "Transported" in df.columns:
+            out[TARGET_COLUMN] = _lookup(*_factorize(df["Transported"], ffill=False), BOOL_CODES)
+        deck_index = _lookup(cabin_codes, decks, {name: i for i, name in enumerate(self.cabin_letters_)})
+        for i, name in enumerate(self.cabin_letters_):
+            out[f"Cabin_Letter_OHE_{name}"] = (deck_index == i).astype("float32")
+
+        return pd.DataFrame(out, index=df.index), next_carry
+
+
+def clean_data(df: pd.DataFrame) -> pd.DataFrame:
+    """Port of ``clean_data`` from the Spaceship Titanic notebook.
+
+    Kept as the reference implementation for ``bench_features``; the pipeline
+    uses :class:`FeatureTransformer`.
+    """
+    new_data = df.drop("Name", axis=1)
+    new_data["Age"] = new_data["Age"].fillna(new_data["Age"].mean())
+    new_data["Age"] = new_data["Age"].replace(0, new_data["Age"].mean())
+    for column in ("CryoSleep", "Destination", "VIP", "HomePlanet", "Cabin"):
+        new_data[column] = new_data[column].ffill()
+
+    new_data = new_data.fillna({column: 0 for column in COST_COLUMNS})
+    new_data["Total costs"] = 0
+    for column in COST_COLUMNS:
+        new_data["Total costs"] = new_data["Total costs"] + new_data[column]
+    new_data = new_data.drop(COST_COLUMNS, axis=1)
+    costs_bins = new_data["Total costs"].quantile([0, 0.5, 0.75, 0.85, 0.9, 0.95, 0.96, 0.98, 0.99, 1])
+    new_data["Group_costs"] = pd.cut(
+        new_data["Total costs"],
+        costs_bins,
+        labels=["1", "2", "3", "4", "5", "6", "7", "8", "9"],
+        right=True,
+        include_lowest=True,
+    )
+    new_data = new_data.drop("Total costs", axis=1)
+    new_data["Group_costs"] = new_data["Group_costs"].astype("float64")
+
+    cabin_df = new_data["Cabin"].str.split("/", expand=True)
+    cabin_df.columns = ["Cabin_Letter", "Cabin_No", "Cabin_type"]
+    new_data = pd.concat([new_data, cabin_df], axis=1)
+    new_data = new_data.drop("Cabin", axis=1)
+    new_data["Cabin_No"] = new_data["Cabin_No"].astype("float64")
+    return new_data
+
+
+def get_transform(df: pd.DataFrame) -> pd.DataFrame:
+    """Port of ``get_transform`` from the notebook.
+
+    Handles both the train frame (with ``Transported``) and the test frame (without it).
+    """
+    cols_to_drop = []
+    df["HomePlanet_code"] = df["HomePlanet"].map({"Earth": 0, "Europa": 1, "Mars": 2})
+    df["CryoSleep_code"] = df["CryoSleep"].map({False: 0, True: 1})
+    df["Destination_code"] = df["Destination"].map({"TRAPPIST-1e": 0, "55 Cancri e": 1, "PSO J318.5-22": 2})
+    df["VIP_code"] = df["VIP"].map({False: 0, True: 1})
+    df["Cabin_type_code"] = df["Cabin_type"].map({"S": 0, "P": 1})
+    cols_to_drop.extend(["HomePlanet", "CryoSleep", "Destination", "VIP", "Cabin_type"])
+    if "Transported" in df.columns:
+        df[TARGET_COLUMN] = df["Transported"].map({False: 0, True: 1})
+        cols_to_drop.append("Transported")
+
+    cabin_dummies = pd.get_dummies(df["Cabin_Letter"], prefix="Cabin_Letter_OHE")
+    df = pd.concat([df, cabin_dummies], axis=1)
+    cols_to_drop.append("Cabin_Letter")
+    return df.drop(cols_to_drop, axis=1)
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+from sklearn.base import BaseEstimator
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import GridSearchCV, HalvingGridSearchCV
+from sklearn.naive_bayes import BernoulliNB, GaussianNB, MultinomialNB
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.svm import SVC
+from sklearn.tree import DecisionTreeClassifier
+
+try:
+    from xgboost.sklearn import XGBClassifier
+except ImportError:  # xgboost is optional
+    XGBClassifier = None
+
+SEARCH_STRATEGIES = ("grid", "halving")
+
+
+@dataclass(frozen=True)
+class ModelSpec:
+    factory: Callable[[], BaseEstimator]
+    param_grid: Dict[str, List[Any]]
+    scoring: str = "accuracy"
+    # MultinomialNB needs non-negative inputs, so it is fit on the unscaled matrix
+    scaled: bool = True
+
+
+# Grids are the ones used in the notebook
+MODEL_SPECS: Dict[str, ModelSpec] = {
+    "knn": ModelSpec(
+        KNeighborsClassifier,
+        {"n_neighbors": [2, 3, 4, 5, 10, 15], "metric": ["cosine", "euclidean", "manhattan"]},
+    ),
+    "gaussian_nb": ModelSpec(GaussianNB, {"var_smoothing": [1e-09, 1e-10, 1e-12]}, scoring="f1"),
+    "bernoulli_nb": ModelSpec(
+        BernoulliNB,
+        {"alpha": [0.001, 0.01, 0.1, 0.2], "binarize": [0.0, 0.2, 0.3], "fit_prior": [True, False]},
+        scoring="f1",
+    ),
+    "multinomial_nb": ModelSpec(
+        MultinomialNB,
+        {"alpha": [0.001, 0.01, 0.1, 0.2], "fit_prior": [True, False]},
+        scoring="f1",
+        scaled=False,
+    ),
+    "decision_tree": ModelSpec(
+        DecisionTreeClassifier,
+        {
+            "criterion": ["entropy", "gini", "log_loss"],
+            "splitter": ["random", "best"],
+            "max_depth": [2, 4, 5, 6, 9],
+            "min_samples_split": [2, 3, 4, 5, 6],
+        },
+        scoring="f1",
+    ),
+    "svm": ModelSpec(SVC, {"kernel": ["linear", "poly", "sigmoid"], "degree": [2, 4, 10], "C": [1, 2, 3]}),
+    "logistic_regression": ModelSpec(LogisticRegression, {"penalty": ["l2"], "C": [1, 1.1, 0.9]}),
+    "random_forest": ModelSpec(
+        RandomForestClassifier,
+        {
+            "n_estimators": [2, 4, 6, 8, 10, 20],
+            "criterion": ["gini", "entropy"],
+            "max_depth": [2, 4, 6, 7],
+            "min_samples_split": [2, 3, 4, 5],
+        },
+    ),
+    "gradient_boosting": ModelSpec(
+        GradientBoostingClassifier,
+        {"n_estimators": [2, 3, 4, 5, 6], "max_depth": [3, 5, 7, 9], "learning_rate": [0.1, 0.5, 0.01]},
+    ),
+}
+if XGBClassifier is not None:
+    MODEL_SPECS["xgboost"] = ModelSpec(
+        XGBClassifier,
+        {"n_estimators": [2, 4, 6, 8, 10], "max_depth": [2, 3, 4, 5, 6], "learning_rate": [0.1, 0.01, 0.05]},
+    )
+
+
+@dataclass
+class SearchResult:
+    name: str
+    strategy: str
+    best_score: float
+    best_params: Dict[str, Any]
+    test_score: float
+    n_candidates: int
+    wall_time_seconds: float
+    # Set when the sweep raised; the score fields are then meaningless
+    error: Optional[str] = None
+
+    @classmethod
+    def failed(cls, name: str, strategy: str, exc: BaseException) -> "SearchResult":
+        # sklearn wraps failed fits in a multi-line message that ends with the underlying error
+        lines = [line.strip() for line in str(exc).splitlines() if line.strip()]
+        return cls(
+            name=name,
+            strategy=strategy,
+            best_score=float("nan"),
+            best_params={},
+            test_score=float("nan"),
+            n_candidates=0,
+            wall_time_seconds=0.0,
+            error=lines[-1] if len(lines) > 1 else f"{type(exc).__name__}: {exc}",
+        )
+
+
+def make_search(name: str, strategy: str = "grid", cv: int = 5, random_state: int = 42):
+    if strategy not in SEARCH_STRATEGIES:
+        raise ValueError(f"Unknown search strategy: {strategy}")
+    spec = MODEL_SPECS[name]
+    if strategy == "halving":
+        # Successive halving: every round keeps the best 1/factor of the candidates
+        # and gives them factor times more samples, so weak configs stop early.
+        return HalvingGridSearchCV(
+            spec.factory(),
+            param_grid=spec.param_grid,
+            scoring=spec.scoring,
+            cv=cv,
+            factor=3,
+            random_state=random_state,
+            n_jobs=1,
+        )
+    return GridSearchCV(spec.factory(), param_grid=spec.param_grid, scoring=spec.scoring, cv=cv, n_jobs=1)
+
+
+def run_search(
+    name: str,
+    X_train: np.ndarray,
+    y_train: np.ndarray,
+    X_test: np.ndarray,
+    y_test: np.ndarray,
+    strategy: str = "grid",
+    cv: int = 5,
+    random_state: int = 42,
+) -> SearchResult:
+    """Run one model sweep. Executed inside a pool worker, so it must stay top-level."""
+    started = time.perf_counter()
+    search = make_search(name, strategy=strategy, cv=cv, random_state=random_state)
+    search.fit(X_train, y_train)
+    test_score = float(search.score(X_test, y_test))
+    return SearchResult(
+        name=name,
+        strategy=strategy,
+        best_score=float(search.best_score_),
+        best_params=dict(search.best_params_),
+        test_score=test_score,
+        n_candidates=len(search.cv_results_["params"]),
+        wall_time_seconds=time.perf_counter() - started,
+    )
+
+
+def run_all(
+    datasets: Dict[bool, tuple],
+    names: Optional[Iterable[str]] = None,
+    strategy: str = "grid",
+    cv: int = 5,
+    max_workers: Optional[int] = None,
+    random_state: int = 42,
+) -> List[SearchResult]:
+    """Run every sweep concurrently on a process pool.
+
+    ``datasets`` maps ``scaled`` -> ``(X_train, y_train, X_test, y_test)``. Each
+    sweep runs single-threaded inside its worker so the pool is the only source
+    of parallelism and cores are not oversubscribed. A sweep that raises is
+    reported through :attr:`SearchResult.error` and does not discard the others.
+    """
+    selected = list(names) if names is not None else list(MODEL_SPECS)
+    unknown = [n for n in selected if n not in MODEL_SPECS]
+    if unknown:
+        raise ValueError(f"Unknown models: {', '.join(unknown)}")
+
+    workers = max_workers or min(len(selected), os.cpu_count() or 1)
+    results: List[SearchResult] = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(
+                run_search,
+                name,
+                *datasets[MODEL_SPECS[name].scaled],
+                strategy=strategy,
+                cv=cv,
+                random_state=random_state,
+            ): name
+            for name in selected
+        }
+        for future in as_completed(futures):
+            try:
+                results.append(future.result())
+            except Exception as exc:
+                results.append(SearchResult.failed(futures[future], strategy, exc))
+    # Longest sweeps first, which is what you want to look at when tuning the grids
+    results.sort(key=lambda r: r.wall_time_seconds, reverse=True)
+    return results